@@ -21,11 +21,11 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 import asyncio
+import contextlib
+import dataclasses
 import pathlib
-import time
 import traceback
 import typing
-from sre_compile import isstring
 
 from lsst.ts import salobj, utils
 from lsst.ts.idl.enums import ATSpectrograph
@@ -33,7 +33,7 @@ from lsst.ts.idl.enums import ATSpectrograph
 from . import __version__
 from .config_schema import CONFIG_SCHEMA
 from .mock_controller import MockSpectrographController
-from .model import Model
+from .model import ElementStatus, Model
 
 __all__ = ["CSC", "run_atspectrograph_csc"]
 
@@ -43,6 +43,84 @@ FW_ERROR = 3
 GW_ERROR = 4
 CONNECTION_ERROR = 5
 
+# Number of consecutive health loop iterations with no change in the state of
+# the elements before the polling interval is doubled.
+_HEALTH_LOOP_IDLE_ITERATIONS = 3
+# Maximum health loop polling interval, as a multiple of the heartbeat
+# interval.
+_HEALTH_LOOP_MAX_INTERVAL_FACTOR = 10
+
+# Pause before querying an element directly, when the health monitor loop
+# is not running to provide its status (in seconds). It starts at the
+# minimum, grows by the backoff factor while the element state does not
+# change, up to the maximum, and is reset when the state changes.
+_STATUS_POLL_MIN_INTERVAL = 0.05
+_STATUS_POLL_MAX_INTERVAL = 0.5
+_STATUS_POLL_BACKOFF = 1.5
+
+# Maximum age of a status read by the health monitor loop for a motion
+# command to use it instead of querying the controller (in seconds).
+_STATUS_MAX_AGE = 0.5
+
+# Time after the last startIntegration from ATCamera after which the camera
+# is assumed to no longer be exposing, in case a startReadout was missed
+# (in seconds).
+_MAX_EXPOSURE_TIME = 900.0
+
+# States in which an element has finished a motion or homing.
+_TERMINAL_STATES = frozenset({ATSpectrograph.Status.STATIONARY})
+
+# Error code of an element that is not in error.
+_ERROR_NONE = ATSpectrograph.Error.NONE
+
+
+def _csv(values: typing.Iterable[typing.Any]) -> str:
+    """Format values as a comma separated string, with no spaces, as
+    published in the settingsAppliedValues event.
+    """
+    return ",".join(map(str, values))
+
+
+@dataclasses.dataclass(frozen=True)
+class ElementBindings:
+    """Model methods, events and lock of a spectrograph element.
+
+    Built once by the CSC, so motions use the bound methods and events
+    directly.
+
+    Parameters
+    ----------
+    name : `str`
+        Name of the element: one of linearStage, filter or disperser.
+    query : `typing.Callable`
+        Model method that queries the status of the element.
+    move : `typing.Callable`
+        Model method that moves the element.
+    home : `typing.Callable`
+        Model method that homes the element.
+    evt_state : `salobj.topics.ControllerEvent`
+        State event of the element.
+    evt_report : `salobj.topics.ControllerEvent`
+        Reported position event of the element.
+    evt_inposition : `salobj.topics.ControllerEvent`
+        In position event of the element.
+    set_position : `typing.Callable`
+        CSC method that sets, without writing, the reported position.
+    lock : `asyncio.Lock`
+        Held for a whole motion, so only one command moves the element at a
+        time.
+    """
+
+    name: str
+    query: typing.Callable[..., typing.Awaitable[ElementStatus]]
+    move: typing.Callable[..., typing.Awaitable[str]]
+    home: typing.Callable[..., typing.Awaitable[str]]
+    evt_state: salobj.topics.ControllerEvent
+    evt_report: salobj.topics.ControllerEvent
+    evt_inposition: salobj.topics.ControllerEvent
+    set_position: typing.Callable[..., None]
+    lock: asyncio.Lock
+
 
 class CSC(salobj.ConfigurableCsc):
     """
@@ -85,12 +163,53 @@ class CSC(salobj.ConfigurableCsc):
         initial_state: salobj.State = salobj.State.STANDBY,
         simulation_mode: int = 0,
     ) -> None:
-        # flag to monitor if camera is exposing or not, if True, motion
-        # commands will be rejected.
-        self.is_exposing = False
-
-        self.want_connection = False
+        # Cleared while the camera is exposing. Motion commands are rejected,
+        # and motions in progress are stopped, while it is clear.
+        self._not_exposing = asyncio.Event()
+        self._not_exposing.set()
+        # Number of startIntegration events not yet matched by a
+        # startReadout, and the timer that gives up waiting for them.
+        self._exposures_in_progress = 0
+        self._exposure_timer: typing.Optional[asyncio.TimerHandle] = None
+
+        # Held while connecting to the controller, so concurrent callers
+        # share a single connection attempt.
+        self._connect_lock = asyncio.Lock()
         self._health_loop = utils.make_done_future()
+        # Set to ask the health monitor loop to stop; it also cuts short the
+        # wait between iterations, so the loop exits promptly.
+        self._health_loop_stop = asyncio.Event()
+        # Set to make the health monitor loop check again whether it should
+        # stop or start its next iteration sooner.
+        self._health_loop_wakeup = asyncio.Event()
+        # Latest status of each element read by the health monitor loop, the
+        # event loop time at which it was queried, and events pulsed every
+        # time a new status is read, keyed by the name of the element.
+        self._last_status: typing.Dict[str, typing.Optional[ElementStatus]] = dict(
+            linearStage=None, filter=None, disperser=None
+        )
+        self._last_status_time = dict(linearStage=0.0, filter=0.0, disperser=0.0)
+        self._new_status = dict(
+            linearStage=asyncio.Event(),
+            filter=asyncio.Event(),
+            disperser=asyncio.Event(),
+        )
+        # Event loop time at which all motions were last stopped; statuses
+        # queried before then are not reused.
+        self._motion_stopped_time = 0.0
+        # Current health loop polling interval; grows while the elements are
+        # idle and is reset whenever they change or a motion is commanded.
+        self._health_interval = salobj.base_csc.HEARTBEAT_INTERVAL
+        # Status poll interval last asked for by a motion of each element.
+        # While the element lock is held it caps the health loop polling
+        # interval.
+        self._status_poll_interval = dict(
+            linearStage=_STATUS_POLL_MAX_INTERVAL,
+            filter=_STATUS_POLL_MAX_INTERVAL,
+            disperser=_STATUS_POLL_MAX_INTERVAL,
+        )
+        # Polling interval the health loop is waiting for.
+        self._health_wait_interval = self._health_interval
 
         self.timeout = 5.0
 
@@ -111,11 +230,43 @@ class CSC(salobj.ConfigurableCsc):
             else None
         )
 
-        self._report_position_options = dict(
-            reportedFilterPosition=self.report_filter_position,
-            reportedDisperserPosition=self.report_disperser_position,
-            reportedLinearStagePosition=self.report_linear_stage_position,
+        # Each element has its own lock to serialize its motions.
+        # stopAllAxes does not take these locks, so it can always interrupt
+        # a motion.
+        self._linear_stage = ElementBindings(
+            name="linearStage",
+            query=self.model.query_gs_status,
+            move=self.model.move_gs,
+            home=self.model.init_gs,
+            evt_state=self.evt_lsState,
+            evt_report=self.evt_reportedLinearStagePosition,
+            evt_inposition=self.evt_linearStageInPosition,
+            set_position=self.set_linear_stage_position,
+            lock=asyncio.Lock(),
         )
+        self._filter_wheel = ElementBindings(
+            name="filter",
+            query=self.model.query_fw_status,
+            move=self.model.move_fw,
+            home=self.model.init_fw,
+            evt_state=self.evt_fwState,
+            evt_report=self.evt_reportedFilterPosition,
+            evt_inposition=self.evt_filterInPosition,
+            set_position=self.set_filter_position,
+            lock=asyncio.Lock(),
+        )
+        self._grating_wheel = ElementBindings(
+            name="disperser",
+            query=self.model.query_gw_status,
+            move=self.model.move_gw,
+            home=self.model.init_gw,
+            evt_state=self.evt_gwState,
+            evt_report=self.evt_reportedDisperserPosition,
+            evt_inposition=self.evt_disperserInPosition,
+            set_position=self.set_disperser_position,
+            lock=asyncio.Lock(),
+        )
+
         # Add a remote for the ATCamera to monitor if it is exposing or not.
         # If it is, reject commands that would cause motion.
         self.atcam_remote = salobj.Remote(
@@ -154,30 +305,18 @@ class CSC(salobj.ConfigurableCsc):
         if self.mock_ctrl is not None and not self.mock_ctrl.initialized:
             await self.mock_ctrl.start()
 
+        if self.summary_state != salobj.State.ENABLED:
+            # Ask the health monitor loop to stop whenever the CSC leaves
+            # enabled, including when it goes to fault.
+            self._health_loop_stop.set()
+            self._health_loop_wakeup.set()
+
         if not self.disabled_or_enabled and self.model.connected:
-            self.log.warning(f"CSC in {self.summary_state!r} disconnecting...")
-            try:
-                self.model.disconnect()
-            except Exception:
-                self.log.exception("Error disconnecting from controller. Ignoring.")
-                self.want_connection = True
+            self.log.warning("CSC in %r disconnecting...", self.summary_state)
+            await self.disconnect()
 
         await super().handle_summary_state()
 
-    async def end_start(self, data: salobj.type_hints.BaseMsgType) -> None:
-        """end do_start; called after state changes.
-
-        This method call setup on the model, passing the selected setting.
-
-        Parameters
-        ----------
-        data : ATSpectrograph_command_start
-            Command data
-        """
-        self.want_connection = True
-
-        await super().end_start(data)
-
     async def begin_enable(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Begin do_enable; called before state changes.
 
@@ -207,169 +346,244 @@ class CSC(salobj.ConfigurableCsc):
         """
 
         # start connection with the controller
-        if not self.model.connected:
+        async with self.fault_on_error(
+            code=CONNECTION_ERROR, report="Cannot connect to controller."
+        ):
             try:
-                await self.model.connect()
-            except Exception as e:
-                await self.fault(
-                    code=CONNECTION_ERROR,
-                    report="Cannot connect to controller.",
-                    traceback=traceback.format_exc(),
-                )
-
-                try:
-                    await self.model.disconnect()
-                except Exception:
-                    self.log.exception(
-                        "Ignoring exception while trying to disconnect from controller."
-                    )
-
-                raise e
-
-            self.want_connection = False
+                await self.ensure_connection()
+            except Exception:
+                await self.disconnect()
+                raise
+
+        # Query all the elements at once; a failure to query one of them is
+        # reported below, with the element that failed.
+        ls_state, fw_state, gw_state = await asyncio.gather(
+            self.model.query_gs_status(),
+            self.model.query_fw_status(),
+            self.model.query_gw_status(),
+            return_exceptions=True,
+        )
 
-        try:
+        async with self.fault_on_error(
+            code=CONNECTION_ERROR,
+            report="Cannot get information from model for linear stage.",
+        ):
             # Check/Report linear stage position. Home if position is out of
             # range.
-            state = await self.model.query_gs_status(self.want_connection)
-            self.log.debug(f"query_gs_status: {state}")
+            if isinstance(ls_state, Exception):
+                raise ls_state
+            state = ls_state
+            self.log.debug("query_gs_status: %s", state)
 
-            await self.evt_lsState.set_write(state=state[0], force_output=True)
-            if state[1] < 0.0:
+            await self.evt_lsState.set_write(state=state.status, force_output=True)
+            if state.position < 0.0:
                 self.log.warning("Linear stage out of range. Homing.")
-                await self.home_element(
-                    query="query_gs_status",
-                    home="init_gs",
-                    report="reportedLinearStagePosition",
-                    inposition="linearStageInPosition",
-                    report_state="lsState",
-                )
+                await self.home_element(self._linear_stage, abort_if_exposing=False)
             else:
-                await self.evt_reportedLinearStagePosition.set_write(position=state[1])
-        except Exception as e:
-            await self.fault(
-                code=CONNECTION_ERROR,
-                report="Cannot get information from model for linear stage.",
-                traceback=traceback.format_exc(),
-            )
-            raise e
+                await self.evt_reportedLinearStagePosition.set_write(
+                    position=state.position
+                )
 
-        try:
+        async with self.fault_on_error(
+            code=CONNECTION_ERROR,
+            report="Cannot get information from model for filter wheel.",
+        ):
             # Check/Report Filter Wheel position.
-            state = await self.model.query_fw_status(self.want_connection)
-            self.log.debug(f"query_fw_status: {state}")
-
-            await self.evt_fwState.set_write(state=state[0], force_output=True)
-            await self.evt_reportedFilterPosition.set_write(
-                slot=int(state[1]),
-                name=self.filter_info["filter_name"][int(state[1])],
-                band=self.filter_info["band"][int(state[1])],
-                centralWavelength=self.filter_info["central_wavelength_filter"][
-                    int(state[1])
-                ],
-                focusOffset=self.filter_info["offset_focus_filter"][int(state[1])],
-                pointingOffsets=[
-                    self.filter_info["offset_pointing_filter"]["x"][int(state[1])],
-                    self.filter_info["offset_pointing_filter"]["y"][int(state[1])],
-                ],
+            if isinstance(fw_state, Exception):
+                raise fw_state
+            state = fw_state
+            self.log.debug("query_fw_status: %s", state)
+
+            await self.evt_fwState.set_write(state=state.status, force_output=True)
+            self.set_filter_position(
+                position=state.position,
+                position_name=self.filter_info["filter_name"][int(state.position)],
             )
+            await self.evt_reportedFilterPosition.write()
             self.log.debug("sent evt_reportedFilterPosition in end_enable")
-        except Exception as e:
-            await self.fault(
-                code=CONNECTION_ERROR,
-                report="Cannot get information from model for filter wheel.",
-                traceback=traceback.format_exc(),
-            )
-            raise e
 
-        try:
+        async with self.fault_on_error(
+            code=CONNECTION_ERROR,
+            report="Cannot get information from model for grating/disperser wheel.",
+        ):
             # Check/Report Grating/Disperser Wheel position.
-            state = await self.model.query_gw_status(self.want_connection)
-            self.log.debug(f"query_gw_status: {state}")
-            await self.evt_gwState.set_write(state=state[0], force_output=True)
-            await self.evt_reportedDisperserPosition.set_write(
-                slot=int(state[1]),
-                name=self.grating_info["grating_name"][int(state[1])],
-                band=self.grating_info["band"][int(state[1])],
-                pointingOffsets=[
-                    self.grating_info["offset_pointing_grating"]["x"][int(state[1])],
-                    self.grating_info["offset_pointing_grating"]["y"][int(state[1])],
-                ],
+            if isinstance(gw_state, Exception):
+                raise gw_state
+            state = gw_state
+            self.log.debug("query_gw_status: %s", state)
+            await self.evt_gwState.set_write(state=state.status, force_output=True)
+            self.set_disperser_position(
+                position=state.position,
+                position_name=self.grating_info["grating_name"][int(state.position)],
             )
+            await self.evt_reportedDisperserPosition.write()
             self.log.debug("sent evt_reportedDisperserPosition in end_enable")
 
-        except Exception as e:
-            await self.fault(
-                code=CONNECTION_ERROR,
-                report="Cannot get information from model for "
-                "grating/disperser wheel.",
-                traceback=traceback.format_exc(),
-            )
-            raise e
-
-        self._health_loop = asyncio.ensure_future(self.health_monitor_loop())
+        await self.stop_health_loop()
+        self._health_loop_stop.clear()
+        # The elements were just queried above, so the first health loop
+        # iteration can wait for a whole interval.
+        self._health_loop = asyncio.create_task(
+            self.health_monitor_loop(start_delay=salobj.base_csc.HEARTBEAT_INTERVAL)
+        )
 
         await super().end_enable(data)
 
+    @contextlib.asynccontextmanager
+    async def fault_on_error(
+        self, code: int, report: str
+    ) -> typing.AsyncIterator[None]:
+        """Go to fault if the body raises, then re-raise the exception.
+
+        Parameters
+        ----------
+        code : `int`
+            Error code for the ``errorCode`` event.
+        report : `str`
+            Description of the error.
+        """
+        try:
+            yield
+        except Exception:
+            await self.fault(code=code, report=report, traceback=traceback.format_exc())
+            raise
+
+    async def ensure_connection(self) -> None:
+        """Connect to the controller, unless already connected.
+
+        Concurrent callers share a single connection attempt.
+        """
+        async with self._connect_lock:
+            if not self.model.connected:
+                await self.model.connect()
+
     async def end_disable(self, data: salobj.type_hints.BaseMsgType) -> None:
-        # TODO: Russell Owen suggest using putting this in
-        # `handle_summary_state` instead and calling it whenever the state
-        # leaves "enabled".
+        # salobj calls end_disable before handle_summary_state, so ask the
+        # health loop to stop here, then wait for it.
+        self._health_loop_stop.set()
+        self._health_loop_wakeup.set()
         try:
             await asyncio.wait_for(self._health_loop, timeout=self.timeout)
         except asyncio.TimeoutError:
-            self.log.exception(
-                "Wait for health loop to complete timed out. Cancelling."
-            )
+            self.log.warning("Wait for health loop to complete timed out. Cancelling.")
 
-            self._health_loop.cancel()
+            await self.stop_health_loop()
 
-            try:
-                await self._health_loop
-            except asyncio.CancelledError:
-                self.log.debug("Heath monitor loop canceled.")
+        await self.disconnect()
+
+        await super().end_disable(data)
+
+    async def disconnect(self) -> None:
+        """Disconnect from the controller, logging and ignoring errors.
 
+        The disconnection runs to completion even if the caller is
+        cancelled, so the connection is not left half closed.
+        """
+        disconnect_task = asyncio.create_task(self.model.disconnect())
         try:
-            await self.model.disconnect()
+            await asyncio.shield(disconnect_task)
+        except asyncio.CancelledError:
+            try:
+                await disconnect_task
+            except Exception:
+                self.log.exception("Error disconnecting from controller.")
+            raise
         except Exception:
             self.log.exception("Error disconnecting from controller.")
 
-        await super().end_disable(data)
+    async def health_monitor_loop(self, start_delay: float = 0.0) -> None:
+        """A coroutine to monitor the state of the hardware.
 
-    async def health_monitor_loop(self) -> None:
-        """A coroutine to monitor the state of the hardware."""
+        The loop runs while the CSC is enabled, until ``_health_loop_stop``
+        is set.
 
-        while self.summary_state == salobj.State.ENABLED:
-            try:
-                ls_state = await self.model.query_gs_status(self.want_connection)
-                fw_state = await self.model.query_fw_status(self.want_connection)
-                gw_state = await self.model.query_gw_status(self.want_connection)
+        The polling interval starts at the heartbeat interval and is doubled,
+        up to ``_HEALTH_LOOP_MAX_INTERVAL_FACTOR`` times the heartbeat
+        interval, every ``_HEALTH_LOOP_IDLE_ITERATIONS`` iterations in which
+        none of the elements change. While an element moves, the loop polls
+        at the interval asked for by the motion instead, if shorter; see
+        `health_loop_interval`.
+
+        Parameters
+        ----------
+        start_delay : `float`, optional
+            Time to wait before the first iteration (in seconds). The wait is
+            cut short if the loop is woken up.
+        """
 
-                if self.want_connection:
-                    self.want_connection = False
+        self.reset_health_loop_interval()
+        max_interval = (
+            _HEALTH_LOOP_MAX_INTERVAL_FACTOR * salobj.base_csc.HEARTBEAT_INTERVAL
+        )
+        previous_states = None
+        idle_iterations = 0
+        # Iterations are scheduled at a fixed rate, from the start of the
+        # previous iteration, so slow queries do not make the loop drift.
+        loop = asyncio.get_running_loop()
+        if start_delay > 0:
+            await self.wait_health_loop_interval(start_delay)
+        next_tick = loop.time()
+
+        while (
+            self.summary_state == salobj.State.ENABLED
+            and not self._health_loop_stop.is_set()
+        ):
+            try:
+                status_time = loop.time()
+                ls_state, fw_state, gw_state = await self.model.query_all_status()
+
+                states = (ls_state, fw_state, gw_state)
+                if states != previous_states:
+                    self.reset_health_loop_interval()
+                    idle_iterations = 0
+                else:
+                    idle_iterations += 1
+                    if idle_iterations >= _HEALTH_LOOP_IDLE_ITERATIONS:
+                        self._health_interval = min(
+                            2.0 * self._health_interval, max_interval
+                        )
+                        idle_iterations = 0
+                previous_states = states
+
+                for element, state in zip(
+                    (self._linear_stage, self._filter_wheel, self._grating_wheel),
+                    states,
+                ):
+                    self._last_status[element.name] = state
+                    self._last_status_time[element.name] = status_time
+                    # Wake up everything waiting for a new status.
+                    self._new_status[element.name].set()
+                    self._new_status[element.name].clear()
 
                 # Make sure none of the sub-components are in fault. Go to
                 # fault state if so.
-                if ls_state[2] != ATSpectrograph.Error.NONE:
-                    self.log.error(f"Linear stage in error: {ls_state}")
-                    await self.fault(
-                        code=LS_ERROR, report=f"Linear stage in error: {ls_state}"
-                    )
-                    break
-                elif fw_state[2] != ATSpectrograph.Error.NONE:
-                    self.log.error(f"Filter wheel in error: {fw_state}")
-                    await self.fault(
-                        code=FW_ERROR, report=f"Filter wheel  in error: {fw_state}"
-                    )
-                    break
-                elif gw_state[2] != ATSpectrograph.Error.NONE:
-                    await self.log.error(f"Grating wheel in error: {gw_state}")
-                    self.fault(
-                        code=GW_ERROR, report=f"Grating wheel in error: {gw_state}"
-                    )
-                    break
-
-                await asyncio.sleep(salobj.base_csc.HEARTBEAT_INTERVAL)
+                for state, code, label in (
+                    (ls_state, LS_ERROR, "Linear stage"),
+                    (fw_state, FW_ERROR, "Filter wheel"),
+                    (gw_state, GW_ERROR, "Grating wheel"),
+                ):
+                    if state.error != _ERROR_NONE:
+                        self.log.error("%s in error: %s", label, state)
+                        await self.fault(code=code, report=f"{label} in error: {state}")
+                        return
+
+                # Being woken up does not reschedule the next iteration: the
+                # wait ends early only if the loop is stopping, otherwise it
+                # is computed again, from the start of this iteration, in
+                # case a motion asked for a shorter interval.
+                previous_tick = next_tick
+                while not self._health_loop_stop.is_set():
+                    self._health_wait_interval = self.health_loop_interval()
+                    next_tick = previous_tick + self._health_wait_interval
+                    delay = next_tick - loop.time()
+                    if delay <= 0:
+                        # The iteration took longer than the interval; skip
+                        # the missed ticks instead of running them back to
+                        # back.
+                        next_tick = loop.time()
+                        break
+                    if not await self.wait_health_loop_interval(delay):
+                        break
             except Exception:
                 await self.fault(
                     code=HEALTH_LOOP_DIED,
@@ -377,6 +591,177 @@ class CSC(salobj.ConfigurableCsc):
                     traceback=traceback.format_exc(),
                 )
 
+    async def wait_health_loop_interval(self, interval: float) -> bool:
+        """Wait for the next health monitor loop iteration.
+
+        Returns early if the health loop is woken up, e.g. to stop it or
+        because a motion needs statuses more often.
+
+        Parameters
+        ----------
+        interval : `float`
+            Maximum time to wait (in seconds).
+
+        Returns
+        -------
+        woken_up : `bool`
+            True if the health loop was woken up before the interval elapsed.
+        """
+        try:
+            await asyncio.wait_for(self._health_loop_wakeup.wait(), timeout=interval)
+            woken_up = True
+        except asyncio.TimeoutError:
+            woken_up = False
+        self._health_loop_wakeup.clear()
+        return woken_up
+
+    async def next_status(
+        self,
+        element: ElementBindings,
+        timeout: float,
+        poll_interval: float = _STATUS_POLL_MAX_INTERVAL,
+    ) -> ElementStatus:
+        """Get the next status of an element read by the health monitor
+        loop.
+
+        While the element lock is held, the health loop reads the statuses
+        at most ``poll_interval`` after its previous iteration; it is only
+        woken up if it planned to wait longer. If the health loop is not
+        running, query the controller directly after a pause of
+        ``poll_interval``, so a caller polling in a loop does not flood it.
+
+        Parameters
+        ----------
+        element : `ElementBindings`
+            The element.
+        timeout : `float`
+            How long to wait for the new status (in seconds).
+        poll_interval : `float`, optional
+            Maximum time between status reads (in seconds).
+
+        Returns
+        -------
+        status : `ElementStatus`
+            (status, position, error)
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If no new status is read in time.
+        """
+        if self._health_loop.done():
+            await asyncio.sleep(poll_interval)
+            return await asyncio.wait_for(element.query(), timeout=timeout)
+
+        self._status_poll_interval[element.name] = poll_interval
+        if poll_interval < self._health_wait_interval:
+            self._health_loop_wakeup.set()
+        await asyncio.wait_for(self._new_status[element.name].wait(), timeout=timeout)
+        status = self._last_status[element.name]
+        assert status is not None
+        return status
+
+    async def current_status(self, element: ElementBindings) -> ElementStatus:
+        """Get the current status of an element.
+
+        Use the status last read by the health monitor loop if it is recent
+        enough and was queried after all motions were last stopped,
+        otherwise query the controller.
+
+        Parameters
+        ----------
+        element : `ElementBindings`
+            The element.
+
+        Returns
+        -------
+        status : `ElementStatus`
+            (status, position, error)
+        """
+        status = self._last_status[element.name]
+        status_time = self._last_status_time[element.name]
+        if (
+            status is not None
+            and not self._health_loop.done()
+            and status_time > self._motion_stopped_time
+            and asyncio.get_running_loop().time() - status_time <= _STATUS_MAX_AGE
+        ):
+            return status
+        return await element.query()
+
+    @staticmethod
+    def next_poll_interval(
+        poll_interval: float,
+        previous_state: ElementStatus,
+        state: ElementStatus,
+    ) -> float:
+        """Get the pause before the next direct status query of a moving
+        element.
+
+        Parameters
+        ----------
+        poll_interval : `float`
+            Current pause (in seconds).
+        previous_state : `ElementStatus`
+            Previous status of the element.
+        state : `ElementStatus`
+            Current status of the element.
+
+        Returns
+        -------
+        poll_interval : `float`
+            The minimum pause if the element state changed, otherwise the
+            current pause increased by the backoff factor, up to the maximum.
+        """
+        if state.status != previous_state.status:
+            return _STATUS_POLL_MIN_INTERVAL
+        return min(_STATUS_POLL_BACKOFF * poll_interval, _STATUS_POLL_MAX_INTERVAL)
+
+    def health_loop_interval(self) -> float:
+        """Get the time between health monitor loop iterations.
+
+        Returns
+        -------
+        interval : `float`
+            The polling interval, capped by the status poll interval last
+            asked for by the motion of each element whose lock is held (in
+            seconds).
+        """
+        return min(
+            [self._health_interval]
+            + [
+                self._status_poll_interval[element.name]
+                for element in (
+                    self._linear_stage,
+                    self._filter_wheel,
+                    self._grating_wheel,
+                )
+                if element.lock.locked()
+            ]
+        )
+
+    def reset_health_loop_interval(self) -> None:
+        """Reset the health monitor loop polling interval to the heartbeat
+        interval.
+        """
+        self._health_interval = salobj.base_csc.HEARTBEAT_INTERVAL
+
+    async def stop_health_loop(self) -> None:
+        """Cancel the health monitor loop, if running, and wait for it to
+        finish.
+        """
+        if self._health_loop.done():
+            return
+
+        self._health_loop.cancel()
+
+        try:
+            await self._health_loop
+        except asyncio.CancelledError:
+            self.log.debug("Health monitor loop cancelled.")
+        except Exception:
+            self.log.exception("Health monitor loop failed. Ignoring.")
+
     async def do_changeDisperser(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Change the disperser element.
 
@@ -388,33 +773,29 @@ class CSC(salobj.ConfigurableCsc):
         """
         self.assert_enabled("changeDisperser")
         self.assert_move_allowed("changeDisperser")
+        self.reset_health_loop_interval()
 
         gratings_name = self.grating_info["grating_name"]
 
         if len(data.name) > 0:
-            if data.name not in self.grating_info["grating_name"]:
-                raise RuntimeError(
+            try:
+                disperser_id = self._grating_id_by_name[data.name]
+            except KeyError:
+                raise salobj.base.ExpectedError(
                     f"Invalid disperser name={data.name}, must be one of {gratings_name}."
-                )
+                ) from None
             disperser_name = data.name
-            disperser_id = self.grating_info["grating_name"].index(disperser_name)
         elif 0 <= data.disperser < self.n_grating:
             disperser_id = data.disperser
             disperser_name = self.grating_info["grating_name"][disperser_id]
         else:
-            raise RuntimeError(
+            raise salobj.base.ExpectedError(
                 f"Invalid input. disperser={data.disperser}, must be between "
                 f"0-{self.n_grating-1}. name={data.name}, must be one of {gratings_name}."
             )
 
         await self.move_element(
-            query="query_gw_status",
-            move="move_gw",
-            position=disperser_id,
-            report="reportedDisperserPosition",
-            inposition="disperserInPosition",
-            report_state="gwState",
-            position_name=disperser_name,
+            self._grating_wheel, position=disperser_id, position_name=disperser_name
         )
 
     async def do_changeFilter(self, data: salobj.type_hints.BaseMsgType) -> None:
@@ -428,33 +809,29 @@ class CSC(salobj.ConfigurableCsc):
         """
         self.assert_enabled("changeFilter")
         self.assert_move_allowed("changeFilter")
+        self.reset_health_loop_interval()
 
         filters_name = self.filter_info["filter_name"]
 
         if len(data.name) > 0:
-            if data.name not in self.filter_info["filter_name"]:
-                raise RuntimeError(
+            try:
+                filter_id = self._filter_id_by_name[data.name]
+            except KeyError:
+                raise salobj.base.ExpectedError(
                     f"Invalid filter name={data.name}, must be one of {filters_name}."
-                )
+                ) from None
             filter_name = data.name
-            filter_id = self.filter_info["filter_name"].index(filter_name)
         elif 0 <= data.filter < self.n_filter:
             filter_id = data.filter
             filter_name = self.filter_info["filter_name"][filter_id]
         else:
-            raise RuntimeError(
-                f"Invalid input. filter={data.filter}, must be between"
+            raise salobj.base.ExpectedError(
+                f"Invalid input. filter={data.filter}, must be between "
                 f"0-{self.n_filter-1}. name={data.name}, must be one of {filters_name}."
             )
 
         await self.move_element(
-            query="query_fw_status",
-            move="move_fw",
-            position=filter_id,
-            report="reportedFilterPosition",
-            inposition="filterInPosition",
-            report_state="fwState",
-            position_name=filter_name,
+            self._filter_wheel, position=filter_id, position_name=filter_name
         )
 
     async def do_homeLinearStage(self, data: salobj.type_hints.BaseMsgType) -> None:
@@ -468,14 +845,9 @@ class CSC(salobj.ConfigurableCsc):
         """
         self.assert_enabled("homeLinearStage")
         self.assert_move_allowed("homeLinearStage")
+        self.reset_health_loop_interval()
 
-        await self.home_element(
-            query="query_gs_status",
-            home="init_gs",
-            report="reportedLinearStagePosition",
-            inposition="linearStageInPosition",
-            report_state="lsState",
-        )
+        await self.home_element(self._linear_stage)
 
     async def do_moveLinearStage(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Move linear stage.
@@ -488,15 +860,9 @@ class CSC(salobj.ConfigurableCsc):
         """
         self.assert_enabled("moveLinearStage")
         self.assert_move_allowed("moveLinearStage")
+        self.reset_health_loop_interval()
 
-        await self.move_element(
-            query="query_gs_status",
-            move="move_gs",
-            position=data.distanceFromHome,
-            report="reportedLinearStagePosition",
-            inposition="linearStageInPosition",
-            report_state="lsState",
-        )
+        await self.move_element(self._linear_stage, position=data.distanceFromHome)
 
     async def do_stopAllAxes(self, data: salobj.type_hints.BaseMsgType) -> None:
         """Stop all axes.
@@ -509,7 +875,7 @@ class CSC(salobj.ConfigurableCsc):
         """
         self.assert_enabled("stopAllAxes")
 
-        await self.model.stop_all_motion(self.want_connection)
+        await self.stop_all_motion()
 
         # TODO: Report new state and position since it will hold all previous
         # information, however low priority since this has never actually been
@@ -517,12 +883,8 @@ class CSC(salobj.ConfigurableCsc):
 
     async def move_element(
         self,
-        query: str,
-        move: str,
+        element: ElementBindings,
         position: typing.Union[int, float],
-        report: str,
-        inposition: str,
-        report_state: str,
         position_name: typing.Optional[str] = None,
     ) -> None:
         """A utility function to wrap the steps for moving the filter wheel,
@@ -530,221 +892,286 @@ class CSC(salobj.ConfigurableCsc):
 
         Parameters
         ----------
-        query : str
-            Name of the method that queries the status of the element. Must be
-            one of the three options:
-                - query_gw_status
-                - query_fw_status
-                - query_ls_status
-
-        move : str
-            Name of the method that moves the element. Must be one of the
-            three options:
-                - move_gw
-                - move_fw
-                - move_ls
-
+        element : `ElementBindings`
+            The element to move.
         position : int or float
             Position to move the wheel or the linear stage. Limits are
             checked by the controller and an exception is raised if out of
             range.
-
-        report : str
-            Name of the method responsible for reporting the position. Must
-            be one of the three options:
-                - reportedDisperserPosition
-                - reportedFilterPosition
-                - reportedLinearStagePosition
-
-        inposition : str
-            Name of the method responsible for reporting that element is in
-            position. Must be one of the three options:
-                - disperserInPosition
-                - filterInPosition
-                - linearStageInPosition
-
-        report_state : str
-            Name of the method responsible for reporting the state of the
-            element. Must be one of the three options:
-                - gwState
-                - fwState
-                - lsState
         position_name : str
             Name of the specified position.
         """
 
-        # Verify this was called with an appropriate event
-        if report not in [
-            "reportedLinearStagePosition",
-            "reportedFilterPosition",
-            "reportedDisperserPosition",
-        ]:
-            raise RuntimeError(
-                "Expected report = reportedLinearStagePosition, reportedFilterPosition or "
-                f"reportedDisperserPosition, but got {report}"
-            )
-
-        state = await getattr(self.model, query)(self.want_connection)
-        await getattr(self, f"evt_{report_state}").set_write(state=state[0])
-
-        # Send command to the controller. Limit is checked by model.
-        if state[0] == ATSpectrograph.Status.STATIONARY:
-            await getattr(self, f"evt_{report_state}").set_write(state=state[0])
-            try:
-                await getattr(self.model, move)(position)
-            except Exception as e:
-                await getattr(self, f"evt_{report_state}").set_write(
-                    state=ATSpectrograph.Status.NOTINPOSITION
-                )
-                raise e
-            if position_name is None:
-                # this will be for the linear stage only since it's the only
-                # topic with a position attribute
-                await getattr(self, f"evt_{report}").set_write(position=state[1])
-            await getattr(self, f"evt_{inposition}").set_write(inPosition=False)
-        else:
-            raise RuntimeError(
-                f"Cannot change position. Current state is {ATSpectrograph.Status(state)!r}, "
-                f"expected {ATSpectrograph.Status.STATIONARY!r}."
-            )
+        async with element.lock:
+            reported_name = position_name if isinstance(position_name, str) else ""
 
-        # Need to wait for command to complete
-        start_time = time.time()
-        while True:
-            state = await getattr(self.model, query)(self.want_connection)
+            evt_state = element.evt_state
+            evt_report = element.evt_report
+            evt_inposition = element.evt_inposition
+            tolerance = self.model.tolerance
 
-            await getattr(self, f"evt_{report_state}").set_write(state=state[0])
+            state = await self.current_status(element)
+            await evt_state.set_write(state=state.status)
 
+            # Nothing to do if the element is already in position; skip the
+            # controller round trip and just report it.
             if (
-                state[0] == ATSpectrograph.Status.STATIONARY
-                and state[1] - position <= self.model.tolerance
+                state.status in _TERMINAL_STATES
+                and abs(state.position - position) <= tolerance
             ):
-                await self._report_position_options[report](
-                    position=state[1],
-                    position_name=str(position_name if isstring(position_name) else ""),
+                element.set_position(
+                    position=state.position, position_name=reported_name
+                )
+                await evt_report.write()
+                await evt_inposition.set_write(inPosition=True, force_output=True)
+                return
+
+            # Send command to the controller. Limit is checked by model.
+            if state.status == ATSpectrograph.Status.STATIONARY:
+                try:
+                    await element.move(position)
+                except Exception as e:
+                    await evt_state.set_write(state=ATSpectrograph.Status.NOTINPOSITION)
+                    raise e
+                if position_name is None:
+                    # this will be for the linear stage only since it's the only
+                    # topic with a position attribute
+                    await evt_report.set_write(position=state.position)
+                await evt_inposition.set_write(inPosition=False)
+            else:
+                raise RuntimeError(
+                    f"Cannot change position. Current state is {ATSpectrograph.Status(state.status)!r}, "
+                    f"expected {ATSpectrograph.Status.STATIONARY!r}."
                 )
 
-                await getattr(self, f"evt_{inposition}").set_write(inPosition=True)
-                break
-            elif time.time() - start_time > self.model.move_timeout:
-                raise TimeoutError(
-                    "Change position timed out trying to move to "
-                    f"position {position}."
+            # Need to wait for command to complete. Every new status of the
+            # element comes from the health monitor loop.
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.model.move_timeout
+            poll_interval = _STATUS_POLL_MIN_INTERVAL
+            previous_state = state
+            while True:
+                try:
+                    state = await self.next_status(
+                        element,
+                        timeout=deadline - loop.time(),
+                        poll_interval=poll_interval,
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        "Change position timed out trying to move to "
+                        f"position {position}."
+                    )
+
+                if (
+                    state.status in _TERMINAL_STATES
+                    and abs(state.position - position) <= tolerance
+                ):
+                    # Set all the arrival events first and write them back to
+                    # back, so subscribers see a consistent final state.
+                    state_changed = evt_state.set(state=state.status)
+                    element.set_position(
+                        position=state.position, position_name=reported_name
+                    )
+                    evt_inposition.set(inPosition=True)
+
+                    if state_changed:
+                        await evt_state.write()
+                    await evt_report.write()
+                    await evt_inposition.write()
+                    break
+
+                # Only written if the state changed.
+                await evt_state.set_write(state=state.status)
+
+                poll_interval = self.next_poll_interval(
+                    poll_interval, previous_state, state
                 )
+                previous_state = state
+
+                if loop.time() > deadline:
+                    raise TimeoutError(
+                        "Change position timed out trying to move to "
+                        f"position {position}."
+                    )
 
-            await asyncio.sleep(0.5)
+                await self.abort_motion_if_exposing(element)
 
     async def home_element(
-        self, query: str, home: str, report: str, inposition: str, report_state: str
+        self, element: ElementBindings, abort_if_exposing: bool = True
     ) -> None:
         """Utility method to home subcomponents.
 
-
         Parameters
         ----------
-        query : str
-            Name of the method that queries the status of the element. Must be
-            one of the three options:
-                - query_gw_status
-                - query_fw_status
-                - query_ls_status
-
-        home : str
-            Name of the method that initializes element. Must be one of the
-            three options:
-                - init_gw
-                - init_fw
-                - init_ls
-
-        report : str
-            Name of the method responsible for reporting the position. Must be
-            one of the three options:
-                - reportedDisperserPosition
-                - reportedFilterPosition
-                - reportedLinearStagePosition
-
-        inposition : str
-            Name of the method responsible for reporting that element is in
-            position. Must be one of the three options:
-                - disperserInPosition
-                - filterInPosition
-                - linearStageInPosition
-
-        report_state : str
-            Name of the method responsible for reporting the state of the
-            element. Must be one of the three options:
-                - gwState
-                - fwState
-                - lsState
-
+        element : `ElementBindings`
+            The element to home.
+        abort_if_exposing : `bool`, optional
+            Stop homing and fail if the camera starts exposing before it
+            completes? False when homing the linear stage while enabling
+            the CSC, which should not fail because of an exposure.
         """
 
-        current_state = await getattr(self.model, query)(self.want_connection)
-        stationary_state = ATSpectrograph.Status.STATIONARY
-        homing_state = ATSpectrograph.Status.HOMING
-        not_in_position = ATSpectrograph.Status.NOTINPOSITION
+        async with element.lock:
+            evt_state = element.evt_state
+            evt_report = element.evt_report
+            evt_inposition = element.evt_inposition
 
-        if current_state[0] != stationary_state:
-            raise RuntimeError(
-                f"Element {inposition.split('In')[0]} in {current_state}. "
-                f"Must be in {stationary_state}. Cannot home."
-            )
-        else:
-            await getattr(self, f"evt_{report_state}").set_write(state=homing_state)
+            current_state = await self.current_status(element)
+            stationary_state = ATSpectrograph.Status.STATIONARY
+            homing_state = ATSpectrograph.Status.HOMING
+            not_in_position = ATSpectrograph.Status.NOTINPOSITION
 
-        try:
-            await getattr(self.model, home)()
-            p_state = await getattr(self.model, query)(self.want_connection)
-        except Exception as e:
-            await getattr(self, f"evt_{report_state}").set_write(
-                state=not_in_position, force_output=True
-            )
-            raise e
+            if current_state.status != stationary_state:
+                raise RuntimeError(
+                    f"Element {element.name} in {current_state}. "
+                    f"Must be in {stationary_state}. Cannot home."
+                )
+            else:
+                await evt_state.set_write(state=homing_state)
 
-        await getattr(self, f"evt_{inposition}").set_write(
-            inPosition=False, force_output=True
-        )
+            try:
+                await element.home()
+                state = await element.query()
+            except Exception as e:
+                await evt_state.set_write(state=not_in_position)
+                raise e
 
-        # Need to wait for command to complete
-        start_time = time.time()
-        while True:
-            state = await getattr(self.model, query)(self.want_connection)
+            await evt_inposition.set_write(inPosition=False, force_output=True)
 
-            if p_state[0] != state[0]:
-                await getattr(self, f"evt_{report_state}").set_write(state=state[0])
-                p_state = state
+            # Need to wait for command to complete. Every new status of the
+            # element comes from the health monitor loop.
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.model.move_timeout
+            poll_interval = _STATUS_POLL_MIN_INTERVAL
+            previous_state = state
+            while True:
+                try:
+                    state = await self.next_status(
+                        element,
+                        timeout=deadline - loop.time(),
+                        poll_interval=poll_interval,
+                    )
+                except asyncio.TimeoutError:
+                    raise TimeoutError("Homing element failed...")
 
-            if state[0] == ATSpectrograph.Status.STATIONARY:
-                await getattr(self, f"evt_{report}").set_write(
-                    position=state[1], force_output=True
-                )
-                await getattr(self, f"evt_{inposition}").set_write(
-                    inPosition=True, force_output=True
+                # Only written if the state changed.
+                await evt_state.set_write(state=state.status)
+
+                poll_interval = self.next_poll_interval(
+                    poll_interval, previous_state, state
                 )
-                break
-            elif time.time() - start_time > self.model.move_timeout:
-                raise TimeoutError("Homing element failed...")
+                previous_state = state
+
+                if state.status in _TERMINAL_STATES:
+                    # Forced, so homing an element that is already home
+                    # still reports its position.
+                    await evt_report.set_write(
+                        position=state.position, force_output=True
+                    )
+                    await evt_inposition.set_write(inPosition=True)
+                    break
+                elif loop.time() > deadline:
+                    raise TimeoutError("Homing element failed...")
 
-            await asyncio.sleep(0.1)
+                if abort_if_exposing:
+                    await self.abort_motion_if_exposing(element)
+
+    @property
+    def is_exposing(self) -> bool:
+        """Is the camera exposing?"""
+        return not self._not_exposing.is_set()
 
     def assert_move_allowed(self, action: str) -> None:
         """Assert that moving the spectrograph elements is allowed."""
-        if self.is_exposing:
+        if not self._not_exposing.is_set():
             raise salobj.base.ExpectedError(
                 f"Camera is exposing, {action} is not allowed."
             )
 
+    async def stop_all_motion(self) -> None:
+        """Stop all motions, and stop reusing the statuses queried before."""
+        self._motion_stopped_time = asyncio.get_running_loop().time()
+        await self.model.stop_all_motion()
+
+    async def abort_motion_if_exposing(self, element: ElementBindings) -> None:
+        """Stop all motion and fail if the camera started exposing while an
+        element is moving.
+
+        Parameters
+        ----------
+        element : `ElementBindings`
+            The element that is moving.
+
+        Raises
+        ------
+        salobj.ExpectedError
+            If the camera is exposing.
+        """
+        if self._not_exposing.is_set():
+            return
+
+        self.log.warning(
+            "Camera started integrating while %s was moving. Stopping all motion.",
+            element.name,
+        )
+        try:
+            await self.stop_all_motion()
+        except Exception:
+            self.log.exception("Error stopping all motion. Ignoring.")
+        await element.evt_state.set_write(state=ATSpectrograph.Status.NOTINPOSITION)
+        await element.evt_inposition.set_write(inPosition=False)
+        raise salobj.base.ExpectedError(
+            "Camera started integrating mid-motion; motion stopped."
+        )
+
     def monitor_start_integration_callback(
         self, data: salobj.type_hints.BaseMsgType
     ) -> None:
-        """Set `is_exposing` flag to True."""
-        self.is_exposing = True
+        """Flag that the camera is exposing.
+
+        The flag is cleared automatically if no startReadout arrives within
+        ``_MAX_EXPOSURE_TIME``, so a missed event cannot block motions for
+        good.
+        """
+        self._exposures_in_progress += 1
+        self._not_exposing.clear()
+
+        if self._exposure_timer is not None:
+            self._exposure_timer.cancel()
+        self._exposure_timer = asyncio.get_running_loop().call_later(
+            _MAX_EXPOSURE_TIME, self.exposure_timed_out
+        )
 
     def monitor_start_readout_callback(
         self, data: salobj.type_hints.BaseMsgType
     ) -> None:
-        """Set `is_exposing` flag to False."""
-        self.is_exposing = False
+        """Flag that the camera is no longer exposing, once every
+        exposure started has been read out.
+        """
+        self._exposures_in_progress = max(0, self._exposures_in_progress - 1)
+        if self._exposures_in_progress == 0:
+            self.clear_exposures()
+
+    def exposure_timed_out(self) -> None:
+        """Assume the camera is no longer exposing after missing the
+        startReadout of an exposure.
+        """
+        self.log.warning(
+            "No startReadout from ATCamera %s s after the last startIntegration; "
+            "assuming the camera is no longer exposing.",
+            _MAX_EXPOSURE_TIME,
+        )
+        self._exposure_timer = None
+        self.clear_exposures()
+
+    def clear_exposures(self) -> None:
+        """Flag that no exposure is in progress."""
+        if self._exposure_timer is not None:
+            self._exposure_timer.cancel()
+            self._exposure_timer = None
+        self._exposures_in_progress = 0
+        self._not_exposing.set()
 
     @staticmethod
     def get_config_pkg() -> str:
@@ -756,7 +1183,7 @@ class CSC(salobj.ConfigurableCsc):
         Parameters
         ----------
         config : object
-            The configuration as described by the schema at ``schema_path``,
+            The configuration as described by `CONFIG_SCHEMA`,
             as a struct-like object.
 
         Notes
@@ -772,9 +1199,13 @@ class CSC(salobj.ConfigurableCsc):
             assert isinstance(self.mock_ctrl, MockSpectrographController)
             if config.host != self.mock_ctrl.host or config.port != self.mock_ctrl.port:
                 self.log.warning(
-                    f"Running in simulation mode ({self.simulation_mode}). "
-                    f"Overriding host/port from configuration file {config.host}:{config.port} "
-                    f"to {self.mock_ctrl.host}:{self.mock_ctrl.port}"
+                    "Running in simulation mode (%s). "
+                    "Overriding host/port from configuration file %s:%s to %s:%s",
+                    self.simulation_mode,
+                    config.host,
+                    config.port,
+                    self.mock_ctrl.host,
+                    self.mock_ctrl.port,
                 )
             self.model.host = self.mock_ctrl.host
             self.model.port = self.mock_ctrl.port
@@ -800,59 +1231,15 @@ class CSC(salobj.ConfigurableCsc):
         self.n_filter = self.check_fg_config(self.filter_info)
         self.n_grating = self.check_fg_config(self.grating_info)
 
-        # settingsApplied needs to publish the comma separated string
-        filters_str = {
-            "filter_name": "",
-            "central_wavelength_filter": "",
-            "offset_focus_filter": "",
-            "offset_pointing_filter": "",
-        }
-
-        for i in range(self.n_filter):
-            filters_str["filter_name"] += self.filter_info["filter_name"][i]
-            filters_str["central_wavelength_filter"] += str(
-                self.filter_info["central_wavelength_filter"][i]
-            )
-            filters_str["offset_focus_filter"] += str(
-                self.filter_info["offset_focus_filter"][i]
-            )
-            filters_str["offset_pointing_filter"] += (
-                "["
-                + str((self.filter_info["offset_pointing_filter"])["x"][i])
-                + ","
-                + str((self.filter_info["offset_pointing_filter"])["y"][i])
-                + "]"
-            )
-            # need to add comma, except for the last value
-            if i < self.n_filter - 1:
-                # loop over keys to add a comma for each
-                for key in filters_str:
-                    filters_str[key] += ","
-
-        gratings_str = {
-            "grating_name": "",
-            "offset_focus_grating": "",
-            "offset_pointing_grating": "",
-        }
-        for i in range(self.n_grating):
-            gratings_str["grating_name"] += self.grating_info["grating_name"][i]
-            gratings_str["offset_focus_grating"] += str(
-                self.grating_info["offset_focus_grating"][i]
-            )
-            gratings_str["offset_pointing_grating"] += (
-                "["
-                + str((self.grating_info["offset_pointing_grating"])["x"][i])
-                + ","
-                + str((self.grating_info["offset_pointing_grating"])["y"][i])
-                + "]"
-            )
+        # Map names to slots once so commands resolve them with one lookup.
+        self._filter_id_by_name = self.slot_by_name(self.filter_info["filter_name"])
+        self._grating_id_by_name = self.slot_by_name(self.grating_info["grating_name"])
 
-            # need to add comma, except for the last value
-            if i < self.n_grating - 1:
-                # loop over keys to add a comma for each, do not add a space
-                # after the comma!
-                for key in gratings_str:
-                    gratings_str[key] += ","
+        # settingsApplied needs to publish the comma separated strings; do
+        # not add a space after the comma! All the arrays have the same size,
+        # as checked by check_fg_config.
+        filter_pointing = self.filter_info["offset_pointing_filter"]
+        grating_pointing = self.grating_info["offset_pointing_grating"]
 
         await self.evt_settingsAppliedValues.set_write(
             host=self.model.host,
@@ -860,13 +1247,20 @@ class CSC(salobj.ConfigurableCsc):
             linearStageMinPos=self.model.min_pos,
             linearStageMaxPos=self.model.max_pos,
             linearStageSpeed=0.0,
-            filterNames=filters_str["filter_name"],
-            filterCentralWavelengths=filters_str["central_wavelength_filter"],
-            filterFocusOffsets=filters_str["offset_focus_filter"],
-            filterPointingOffsets=filters_str["offset_pointing_filter"],
-            gratingNames=gratings_str["grating_name"],
-            gratingFocusOffsets=gratings_str["offset_focus_grating"],
-            gratingPointingOffsets=gratings_str["offset_pointing_grating"],
+            filterNames=_csv(self.filter_info["filter_name"]),
+            filterCentralWavelengths=_csv(
+                self.filter_info["central_wavelength_filter"]
+            ),
+            filterFocusOffsets=_csv(self.filter_info["offset_focus_filter"]),
+            filterPointingOffsets=",".join(
+                f"[{x},{y}]" for x, y in zip(filter_pointing["x"], filter_pointing["y"])
+            ),
+            gratingNames=_csv(self.grating_info["grating_name"]),
+            gratingFocusOffsets=_csv(self.grating_info["offset_focus_grating"]),
+            gratingPointingOffsets=",".join(
+                f"[{x},{y}]"
+                for x, y in zip(grating_pointing["x"], grating_pointing["y"])
+            ),
             instrumentPort=config.instrument_port,
             connectionTimeout=self.model.connection_timeout,
             responseTimeout=self.model.read_timeout,
@@ -876,8 +1270,14 @@ class CSC(salobj.ConfigurableCsc):
         self.evt_configurationApplied.set(otherInfo="settingsAppliedValues")
 
     async def close(self) -> None:
+        self.clear_exposures()
+
         if self.mock_ctrl is not None:
-            await self.mock_ctrl.stop(timeout=self.timeout)
+            # stop returns at once if the server is not running.
+            try:
+                await self.mock_ctrl.stop(timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.log.warning("Timed out stopping mock controller. Ignoring.")
 
         await super().close()
 
@@ -931,8 +1331,28 @@ class CSC(salobj.ConfigurableCsc):
 
         return n_info[0]
 
-    async def report_filter_position(self, position: int, position_name: str) -> None:
-        """Report the filter wheel position.
+    @staticmethod
+    def slot_by_name(names: typing.Iterable[str]) -> typing.Dict[str, int]:
+        """Map filter or grating names to their slots.
+
+        Parameters
+        ----------
+        names : `list` of `str`
+            Name of the element in each slot.
+
+        Returns
+        -------
+        slot_by_name : `dict` [`str`, `int`]
+            Slot of each name. A name used in several slots maps to the first
+            one, like ``list.index``.
+        """
+        slot_by_name: typing.Dict[str, int] = {}
+        for slot, name in enumerate(names):
+            slot_by_name.setdefault(name, slot)
+        return slot_by_name
+
+    def set_filter_position(self, position: int, position_name: str) -> None:
+        """Set the reported filter wheel position, without writing it.
 
         Parameters
         ----------
@@ -941,25 +1361,22 @@ class CSC(salobj.ConfigurableCsc):
         position_name : `str`
             Name of the position.
         """
-        await self.evt_reportedFilterPosition.set_write(
-            slot=int(position),
+        slot = int(position)
+        filter_info = self.filter_info
+        self.evt_reportedFilterPosition.set(
+            slot=slot,
             name=position_name,
-            band=self.filter_info["band"][int(position)],
-            centralWavelength=self.filter_info["central_wavelength_filter"][
-                int(position)
-            ],
-            focusOffset=self.filter_info["offset_focus_filter"][int(position)],
+            band=filter_info["band"][slot],
+            centralWavelength=filter_info["central_wavelength_filter"][slot],
+            focusOffset=filter_info["offset_focus_filter"][slot],
             pointingOffsets=[
-                self.filter_info["offset_pointing_filter"]["x"][int(position)],
-                self.filter_info["offset_pointing_filter"]["y"][int(position)],
+                filter_info["offset_pointing_filter"]["x"][slot],
+                filter_info["offset_pointing_filter"]["y"][slot],
             ],
-            force_output=True,
         )
 
-    async def report_disperser_position(
-        self, position: int, position_name: str
-    ) -> None:
-        """Report the disperser wheel position.
+    def set_disperser_position(self, position: int, position_name: str) -> None:
+        """Set the reported disperser wheel position, without writing it.
 
         Parameters
         ----------
@@ -968,22 +1385,21 @@ class CSC(salobj.ConfigurableCsc):
         position_name : `str`
             Name of the position.
         """
-        await self.evt_reportedDisperserPosition.set_write(
-            slot=int(position),
+        slot = int(position)
+        grating_info = self.grating_info
+        self.evt_reportedDisperserPosition.set(
+            slot=slot,
             name=position_name,
-            band=self.grating_info["band"][int(position)],
-            focusOffset=self.grating_info["offset_focus_grating"][int(position)],
+            band=grating_info["band"][slot],
+            focusOffset=grating_info["offset_focus_grating"][slot],
             pointingOffsets=[
-                self.grating_info["offset_pointing_grating"]["x"][int(position)],
-                self.grating_info["offset_pointing_grating"]["y"][int(position)],
+                grating_info["offset_pointing_grating"]["x"][slot],
+                grating_info["offset_pointing_grating"]["y"][slot],
             ],
-            force_output=True,
         )
 
-    async def report_linear_stage_position(
-        self, position: int, position_name: str
-    ) -> None:
-        """Report the linear stage position.
+    def set_linear_stage_position(self, position: int, position_name: str) -> None:
+        """Set the reported linear stage position, without writing it.
 
         Parameters
         ----------
@@ -992,9 +1408,7 @@ class CSC(salobj.ConfigurableCsc):
         position_name : `str`
             Name of the position.
         """
-        await self.evt_reportedLinearStagePosition.set_write(
-            position=position, force_output=True
-        )
+        self.evt_reportedLinearStagePosition.set(position=position)
 
 
 def run_atspectrograph_csc() -> None:
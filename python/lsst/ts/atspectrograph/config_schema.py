@@ -25,7 +25,10 @@ __all__ = ["CONFIG_SCHEMA"]
 
 import yaml
 
-CONFIG_SCHEMA = yaml.safe_load(
+# Use the libyaml based loader, if available; it is about 10 times faster.
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+CONFIG_SCHEMA = yaml.load(
     """
 $schema: http://json-schema.org/draft-07/schema#
 $id: https://github.com/lsst-ts/ts_atspec/blob/master/schema/ATSpectrograph.yaml
@@ -195,5 +198,6 @@ properties:
             minItems: 4
             maxItems: 4
             description: Y-offset in arcseconds.
-"""
+""",
+    Loader=_SafeLoader,
 )
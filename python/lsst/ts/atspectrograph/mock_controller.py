@@ -24,10 +24,9 @@ __all__ = ["MockSpectrographController"]
 
 import asyncio
 import logging
+import math
 import typing
 
-import numpy as np
-
 
 class MockSpectrographController:
     """Mock Spectrograph Controller that talks over TCP/IP.
@@ -44,12 +43,16 @@ class MockSpectrographController:
         self.log = logging.getLogger("MockATSpectrographController")
 
         self._server: typing.Optional[asyncio.base_events.Server] = None
+        # Motions in progress; referenced here so they are not garbage
+        # collected, cancelled by the stop all motions command and when the
+        # server stops.
+        self._move_tasks: typing.Set["asyncio.Task[None]"] = set()
 
         self.wait_time = 1.0
         self.wait_time_move = 5.0
 
-        self.states = ["I", "M", "S", "X"]
-        self.error = ["N", "B", "I", "T"]
+        self.states = [b"I", b"M", b"S", b"X"]
+        self.error = [b"N", b"B", b"I", b"T"]
 
         self._fw_state = 2
         self._fw_pos = 0
@@ -77,7 +80,7 @@ class MockSpectrographController:
                 typing.Callable[[str], typing.Coroutine[typing.Any, typing.Any, bytes]]
             ],
         ] = {
-            "!XXX": None,
+            "!XXX": self.xxx,
             "!LDC": None,
             "?FWS": self.fws,
             "?GRS": self.grs,
@@ -121,6 +124,9 @@ class MockSpectrographController:
         timeout : float
             Timeout to wait server to stop (in seconds).
         """
+        for task in self._move_tasks:
+            task.cancel()
+
         if self._server is None:
             return
 
@@ -159,23 +165,51 @@ class MockSpectrographController:
             self.log.debug(f"read command: {line!r}")
             if line:
                 try:
-                    if line[:4] in self._cmds:
-                        cmd = self._cmds[line[:4]]
-                        assert callable(cmd)
+                    cmd = self._cmds.get(line[:4])
+                    if cmd is not None:
                         reply = await cmd(line[4:])
                         self.log.debug(f"reply: {reply!r}")
-                        writer.write(reply)
-                        await writer.drain()
                     else:
-                        writer.write(" ?Unknown\r\n".encode())
-                        await writer.drain()
+                        reply = b" ?Unknown\r\n"
                 except Exception:
-                    writer.write(" ?Unknown\r\n".encode())
-                    await writer.drain()
+                    reply = b" ?Unknown\r\n"
                     self.log.exception(f"command {line} failed")
-                writer.write(">".encode())
+                # Send the reply and the next prompt in a single write.
+                writer.write(reply + b">")
                 await writer.drain()
 
+    def start_move(self, coro: typing.Coroutine[typing.Any, typing.Any, None]) -> None:
+        """Run a motion in the background.
+
+        Parameters
+        ----------
+        coro : coroutine
+            Coroutine that executes the motion.
+        """
+        task = asyncio.create_task(coro)
+        self._move_tasks.add(task)
+        task.add_done_callback(self._move_tasks.discard)
+
+    async def xxx(self, val: str) -> bytes:
+        """Stop all motions.
+
+        Parameters
+        ----------
+        val : str
+            Ignored
+        """
+        move_tasks = list(self._move_tasks)
+        for task in move_tasks:
+            task.cancel()
+        # Let the motions put the wheels back in a real slot.
+        await asyncio.gather(*move_tasks, return_exceptions=True)
+        self._fw_state = 2
+        self._gw_state = 2
+        self._ls_state = 2
+        self.log.info("All motions stopped.")
+
+        return " ".encode()
+
     async def fws(self, val: str) -> bytes:
         """return filter wheel status
 
@@ -185,7 +219,11 @@ class MockSpectrographController:
             Ignored
         """
         await asyncio.sleep(self.wait_time)
-        return f" {self.states[self._fw_state]} {self._fw_pos} {self.error[self._fw_err]}\r\n".encode()
+        return b" %b %d %b\r\n" % (
+            self.states[self._fw_state],
+            self._fw_pos,
+            self.error[self._fw_err],
+        )
 
     async def grs(self, val: str) -> bytes:
         """return grating wheel status
@@ -196,7 +234,11 @@ class MockSpectrographController:
             Ignored
         """
         await asyncio.sleep(self.wait_time)
-        return f" {self.states[self._gw_state]} {self._gw_pos} {self.error[self._gw_err]}\r\n".encode()
+        return b" %b %d %b\r\n" % (
+            self.states[self._gw_state],
+            self._gw_pos,
+            self.error[self._gw_err],
+        )
 
     async def lss(self, val: str) -> bytes:
         """return linear stage status
@@ -207,7 +249,12 @@ class MockSpectrographController:
             Ignored
         """
         await asyncio.sleep(self.wait_time)
-        return f" {self.states[self._ls_state]} {self._ls_pos} {self.error[self._ls_err]}\r\n".encode()
+        # %a formats the position as str() would, e.g. 0 or 12.5.
+        return b" %b %a %b\r\n" % (
+            self.states[self._ls_state],
+            self._ls_pos,
+            self.error[self._ls_err],
+        )
 
     async def fwi(self, val: str) -> bytes:
         """home filter wheel
@@ -275,7 +322,10 @@ class MockSpectrographController:
         try:
             new_pos = int(val)
             if self.fw_limit[0] <= new_pos <= self.fw_limit[1]:
-                asyncio.create_task(self._execute_fw_move(new_pos))
+                if new_pos == self._fw_pos:
+                    self.log.info(f"Filter wheel already in position {new_pos}.")
+                else:
+                    self.start_move(self._execute_fw_move(new_pos))
                 return " ".encode()
             else:
                 return b"Invalid Argument"
@@ -290,15 +340,18 @@ class MockSpectrographController:
         new_position : int
             New filter wheel position.
         """
-        if self._fw_pos != new_position:
-            self.log.info(f"Moving filter wheel: {self._fw_pos} -> {new_position}.")
-            self._fw_state = 1
-            self._fw_pos = 3
+        self.log.info(f"Moving filter wheel: {self._fw_pos} -> {new_position}.")
+        start_position = self._fw_pos
+        self._fw_state = 1
+        self._fw_pos = 3
+        try:
             await asyncio.sleep(self.wait_time_move)
-            self._fw_state = 2
-            self._fw_pos = new_position
-        else:
-            self.log.info(f"Filter wheel already in position {new_position}.")
+        except asyncio.CancelledError:
+            # Stopped mid-motion; the filter wheel stays in its starting slot.
+            self._fw_pos = start_position
+            raise
+        self._fw_state = 2
+        self._fw_pos = new_position
 
     async def grm(self, val: str) -> bytes:
         """Move grating wheel.
@@ -311,7 +364,10 @@ class MockSpectrographController:
         try:
             new_pos = int(val)
             if self.gw_limit[0] <= new_pos <= self.gw_limit[1]:
-                asyncio.create_task(self._execute_gw_move(new_pos))
+                if new_pos == self._gw_pos:
+                    self.log.info(f"Grating wheel already in position {new_pos}")
+                else:
+                    self.start_move(self._execute_gw_move(new_pos))
                 return " ".encode()
             else:
                 return b"Invalid Argument"
@@ -326,15 +382,18 @@ class MockSpectrographController:
         new_position : int
             New grating wheel position.
         """
-        if self._gw_pos != new_position:
-            self.log.info(f"Moving grating wheel: {self._gw_pos} -> {new_position}.")
-            self._gw_state = 1
-            self._gw_pos = 3
+        self.log.info(f"Moving grating wheel: {self._gw_pos} -> {new_position}.")
+        start_position = self._gw_pos
+        self._gw_state = 1
+        self._gw_pos = 3
+        try:
             await asyncio.sleep(self.wait_time_move)
-            self._gw_state = 2
-            self._gw_pos = new_position
-        else:
-            self.log.info(f"Grating wheel already in position {new_position}")
+        except asyncio.CancelledError:
+            # Stopped mid-motion; the grating wheel stays in its starting slot.
+            self._gw_pos = start_position
+            raise
+        self._gw_state = 2
+        self._gw_pos = new_position
 
     async def lsm(self, val: str) -> bytes:
         """Move linear stage.
@@ -348,7 +407,10 @@ class MockSpectrographController:
         try:
             new_pos = float(val)
             if self.ls_limit[0] <= new_pos <= self.ls_limit[1]:
-                asyncio.create_task(self._execute_ls_move(new_pos))
+                if new_pos == self._ls_pos:
+                    self.log.info(f"Linear stage already in position {new_pos}")
+                else:
+                    self.start_move(self._execute_ls_move(new_pos))
                 return " ".encode()
             else:
                 return b"Invalid Argument"
@@ -363,15 +425,15 @@ class MockSpectrographController:
         new_position : float
             New linear stage positon.
         """
-        if self._ls_pos != new_position:
-            self.log.info(f"Moving linear stage: {self._ls_pos} -> {new_position}.")
-            self._ls_state = 1
-            step = self.ls_step * (1.0 if new_position > self._ls_pos else -1.0)
-            for current_position in np.arange(self._ls_pos, new_position, step):
-                self.log.debug(f"linear stage position: {current_position}")
-                self._ls_pos = current_position
-                await asyncio.sleep(self.ls_step_time)
-            self._ls_pos = new_position
-            self._ls_state = 2
-        else:
-            self.log.info(f"Linear stage already in position {new_position}")
+        self.log.info(f"Moving linear stage: {self._ls_pos} -> {new_position}.")
+        self._ls_state = 1
+        start_position = self._ls_pos
+        step = self.ls_step * (1.0 if new_position > start_position else -1.0)
+        n_steps = math.ceil((new_position - start_position) / step)
+        for i in range(n_steps):
+            current_position = start_position + i * step
+            self.log.debug(f"linear stage position: {current_position}")
+            self._ls_pos = current_position
+            await asyncio.sleep(self.ls_step_time)
+        self._ls_pos = new_position
+        self._ls_state = 2
@@ -27,7 +27,7 @@ import typing
 
 from lsst.ts.idl.enums import ATSpectrograph
 
-__all__ = ["Model"]
+__all__ = ["ElementStatus", "Model"]
 
 _LOCAL_HOST = "127.0.0.1"
 _DEFAULT_PORT = 9999
@@ -35,6 +35,17 @@ _DEFAULT_PORT = 9999
 _limit_decode = {"-": -1, "0": 0, "+": +1}
 
 
+class ElementStatus(typing.NamedTuple):
+    """Status of a spectrograph element, as reported by the controller."""
+
+    status: enum.Enum
+    """Status code, e.g. moving or stationary."""
+    position: typing.Any
+    """Current position."""
+    error: enum.Enum
+    """Error code."""
+
+
 class WheelStatus:
     """Store possible filter wheel status and error codes."""
 
@@ -56,9 +67,7 @@ class WheelStatus:
 class FilterWheelStatus(WheelStatus):
     """Store possible filter wheel status and error codes."""
 
-    def parse_status(
-        self, status: str
-    ) -> typing.Tuple[enum.Enum, typing.Any, enum.Enum]:
+    def parse_status(self, status: str) -> ElementStatus:
         """Parse status string.
 
         Parameters
@@ -69,7 +78,7 @@ class FilterWheelStatus(WheelStatus):
 
         Returns
         -------
-        status : tuple
+        status : `ElementStatus`
             (status, position, error)
 
         """
@@ -82,7 +91,7 @@ class FilterWheelStatus(WheelStatus):
             except ValueError:
                 values[2] = ATSpectrograph.FilterPosition.INBETWEEN
 
-        return self.status[values[1]], values[2], self.error[values[3]]
+        return ElementStatus(self.status[values[1]], values[2], self.error[values[3]])
 
 
 class GratingWheelStatus(FilterWheelStatus):
@@ -211,9 +220,7 @@ class Model:
 
         return self.check_return(ret_val)
 
-    async def query_fw_status(
-        self, want_connection: bool = False
-    ) -> typing.Tuple[enum.Enum, typing.Any, enum.Enum]:
+    async def query_fw_status(self, want_connection: bool = False) -> ElementStatus:
         """Query status of the filter wheel.
 
         status : str
@@ -236,16 +243,14 @@ class Model:
 
         Returns
         -------
-        tuple
+        status : `ElementStatus`
             (status, position, error)
         """
         ret_val = await self.run_command("?FWS\r\n", want_connection=want_connection)
 
         return FilterWheelStatus().parse_status(self.check_return(ret_val))
 
-    async def query_gw_status(
-        self, want_connection: bool = False
-    ) -> typing.Tuple[enum.Enum, typing.Any, enum.Enum]:
+    async def query_gw_status(self, want_connection: bool = False) -> ElementStatus:
         """Query status of the Grating Wheel.
 
         status : str
@@ -268,16 +273,14 @@ class Model:
 
         Returns
         -------
-        status : tuple
+        status : `ElementStatus`
             (status, position, error)
         """
         ret_val = await self.run_command("?GRS\r\n", want_connection=want_connection)
 
         return GratingWheelStatus().parse_status(self.check_return(ret_val))
 
-    async def query_gs_status(
-        self, want_connection: bool = False
-    ) -> typing.Tuple[enum.Enum, typing.Any, enum.Enum]:
+    async def query_gs_status(self, want_connection: bool = False) -> ElementStatus:
         """Query status of the Grating Linear Stage.
 
         status : str
@@ -300,13 +303,42 @@ class Model:
 
         Returns
         -------
-        status : tuple
+        status : `ElementStatus`
             (status, position, error)
         """
         ret_val = await self.run_command("?LSS\r\n", want_connection=want_connection)
 
         return GratingStageStatus().parse_status(self.check_return(ret_val))
 
+    async def query_all_status(
+        self, want_connection: bool = False
+    ) -> typing.Tuple[ElementStatus, ElementStatus, ElementStatus]:
+        """Query status of the Grating Linear Stage, Filter Wheel and Grating
+        Wheel, back to back.
+
+        Parameters
+        ----------
+        want_connection : bool
+            Boolean to specify if a connection with the controller is to be
+            opened in case it is closed.
+
+        Returns
+        -------
+        status : tuple
+            Status of the linear stage, filter wheel and grating wheel, each
+            as returned by `query_gs_status`, `query_fw_status` and
+            `query_gw_status`.
+        """
+        gs_val, fw_val, gw_val = await self.run_commands(
+            ["?LSS\r\n", "?FWS\r\n", "?GRS\r\n"], want_connection=want_connection
+        )
+
+        return (
+            GratingStageStatus().parse_status(self.check_return(gs_val)),
+            FilterWheelStatus().parse_status(self.check_return(fw_val)),
+            GratingWheelStatus().parse_status(self.check_return(gw_val)),
+        )
+
     async def query_gs_limit_switches(self, want_connection: bool = False) -> int:
         """Query grating stage limit switches.
 
@@ -490,7 +522,7 @@ class Model:
 
     async def connect(self) -> None:
         """Connect to the spectrograph controller's TCP/IP port."""
-        self.log.debug(f"connecting to: {self.host}:{self.port}")
+        self.log.debug("connecting to: %s:%s", self.host, self.port)
         if self.connected:
             raise RuntimeError("Already connected")
         host = _LOCAL_HOST if self.simulation_mode == 1 else self.host
@@ -511,7 +543,7 @@ class Model:
         if "Spectrograph" not in read_bytes.decode().rstrip():
             raise RuntimeError("No welcome message from controller.")
 
-        self.log.debug(f"connected: {read_bytes.decode().rstrip()}")
+        self.log.debug("connected: %s", read_bytes.decode().rstrip())
 
     async def disconnect(self) -> None:
         """Disconnect from the spectrograph controller's TCP/IP port."""
@@ -542,45 +574,107 @@ class Model:
             Response from controller.
         """
 
-        self.log.debug(f"run_command: {cmd}")
+        self.log.debug("run_command: %s", cmd)
+
+        await self.check_connected(want_connection)
+        async with self.cmd_lock:
+            return await self.exchange(cmd)
+
+    async def run_commands(
+        self, cmds: typing.Sequence[str], want_connection: bool = False
+    ) -> typing.List[str]:
+        """Send several commands to the TCP/IP controller, back to back, and
+        process their replies.
+
+        The commands are sent one at a time, each after the controller
+        prompt, but no other command can run in between.
+
+        Parameters
+        ----------
+        cmds : `list` [`str`]
+            The commands to send.
+        want_connection : bool
+            Flag to specify if a connection is to be requested in case it is
+            not connected.
+
+        Returns
+        -------
+        read_bytes : `list` [`str`]
+            Response from controller to each command.
+        """
+
+        self.log.debug("run_commands: %s", cmds)
+
+        await self.check_connected(want_connection)
+        async with self.cmd_lock:
+            return [await self.exchange(cmd) for cmd in cmds]
+
+    async def check_connected(self, want_connection: bool) -> None:
+        """Check that the model is connected to the controller.
 
+        Parameters
+        ----------
+        want_connection : bool
+            Flag to specify if a connection is to be requested in case it is
+            not connected.
+
+        Raises
+        ------
+        RuntimeError
+            If not connected and not trying to connect.
+        """
         if not self.connected:
             if want_connection and self.connect_task is not None:
                 await self.connect_task
             else:
                 raise RuntimeError("Not connected and not trying to connect")
-        async with self.cmd_lock:
-            # Make sure controller is ready...
+
+    async def exchange(self, cmd: str) -> str:
+        """Send a command to the controller and read its reply.
+
+        Must be called with ``cmd_lock`` held.
+
+        Parameters
+        ----------
+        cmd : `str`
+            The command to send.
+
+        Returns
+        -------
+        read_bytes : str
+            Response from controller.
+        """
+        # Make sure controller is ready...
+        try:
+            read_bytes = await asyncio.wait_for(
+                self.reader.read(1), timeout=self.read_timeout
+            )
+            if read_bytes != b">":
+                raise RuntimeError(
+                    f"Controller not ready: Received '{read_bytes!r}'..."
+                )
+        except Exception as e:
+            await self.disconnect()
+            raise e
+
+        self.writer.write(f"{cmd}\n".encode())
+        await self.writer.drain()
+
+        if cmd.startswith("?"):
             try:
                 read_bytes = await asyncio.wait_for(
-                    self.reader.read(1), timeout=self.read_timeout
+                    self.reader.readuntil("\r\n".encode()),
+                    timeout=self.read_timeout,
                 )
-                if read_bytes != b">":
-                    raise RuntimeError(
-                        f"Controller not ready: Received '{read_bytes!r}'..."
-                    )
             except Exception as e:
                 await self.disconnect()
                 raise e
+        else:
+            read_bytes = await asyncio.wait_for(
+                self.reader.read(1), timeout=self.read_timeout
+            )
 
-            self.writer.write(f"{cmd}\n".encode())
-            await self.writer.drain()
-
-            if cmd.startswith("?"):
-                try:
-                    read_bytes = await asyncio.wait_for(
-                        self.reader.readuntil("\r\n".encode()),
-                        timeout=self.read_timeout,
-                    )
-                except Exception as e:
-                    await self.disconnect()
-                    raise e
-            else:
-                read_bytes = await asyncio.wait_for(
-                    self.reader.read(1), timeout=self.read_timeout
-                )
-
-            return read_bytes.decode()
+        return read_bytes.decode()
 
     def reset_reader_writer(self) -> None:
         """Reset reader and writer."""
@@ -24,8 +24,10 @@ import asyncio
 import enum
 import logging
 import pathlib
+import types
 import typing
 import unittest
+import unittest.mock
 
 import numpy as np
 from lsst.ts import salobj
@@ -127,6 +129,10 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 await self.remote.cmd_changeFilter.set_start(
                     filter=0, name="bad_filter_name", timeout=LONG_TIMEOUT
                 )
+            with self.assertRaises(salobj.ExpectedError):
+                await self.csc.do_changeFilter(
+                    types.SimpleNamespace(filter=self.csc.n_filter, name="")
+                )
 
             for i, filter_name in enumerate(set_applied.filterNames.split(",")):
                 filter_id = i
@@ -145,18 +151,14 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     )
                     # Verify the filter wheel goes out of position, then into
                     # position
-                    inpos1 = await self.remote.evt_filterInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
-                    )
-                    inpos2 = await self.remote.evt_filterInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
+                    await self.check_in_position_events(
+                        self.remote.evt_filterInPosition,
+                        moved=fpos_initial.slot != filter_id,
                     )
                     fpos = await self.remote.evt_reportedFilterPosition.next(
                         flush=False, timeout=BASE_TIMEOUT
                     )
 
-                    self.assertFalse(inpos1.inPosition)
-                    self.assertTrue(inpos2.inPosition)
                     self.assertEqual(fpos.name, filter_name)
                     self.assertEqual(fpos.slot, filter_id)
 
@@ -207,18 +209,18 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     self.remote.evt_reportedFilterPosition.flush()
                     self.remote.evt_filterInPosition.flush()
 
+                    fpos_initial = await self.remote.evt_reportedFilterPosition.aget(
+                        timeout=BASE_TIMEOUT
+                    )
+
                     await self.remote.cmd_changeFilter.set_start(
                         filter=filter_id, name="", timeout=LONG_TIMEOUT
                     )
-                    inpos1 = await self.remote.evt_filterInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
-                    )
-                    inpos2 = await self.remote.evt_filterInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
+                    await self.check_in_position_events(
+                        self.remote.evt_filterInPosition,
+                        moved=fpos_initial.slot != filter_id,
                     )
                     fpos = self.remote.evt_reportedFilterPosition.get()
-                    self.assertFalse(inpos1.inPosition)
-                    self.assertTrue(inpos2.inPosition)
                     self.assertEqual(fpos.name, filter_name)
                     self.assertEqual(fpos.slot, filter_id)
                     # settingsApplied returns lists of floats, so have to set
@@ -271,6 +273,10 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 await self.remote.cmd_changeDisperser.set_start(
                     disperser=0, name="bad_disperser_name", timeout=LONG_TIMEOUT
                 )
+            with self.assertRaises(salobj.ExpectedError):
+                await self.csc.do_changeDisperser(
+                    types.SimpleNamespace(disperser=self.csc.n_grating, name="")
+                )
 
             for i, disperser_name in enumerate(set_applied.gratingNames.split(",")):
                 disperser_id = i
@@ -287,17 +293,13 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     await self.remote.cmd_changeDisperser.set_start(
                         disperser=0, name=disperser_name, timeout=LONG_TIMEOUT
                     )
-                    inpos1 = await self.remote.evt_disperserInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
-                    )
-                    inpos2 = await self.remote.evt_disperserInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
+                    await self.check_in_position_events(
+                        self.remote.evt_disperserInPosition,
+                        moved=dpos_initial.slot != disperser_id,
                     )
                     dpos = await self.remote.evt_reportedDisperserPosition.next(
                         flush=False, timeout=BASE_TIMEOUT
                     )
-                    self.assertFalse(inpos1.inPosition)
-                    self.assertTrue(inpos2.inPosition)
                     self.assertEqual(dpos.name, disperser_name)
                     self.assertEqual(dpos.slot, disperser_id)
 
@@ -343,20 +345,20 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     self.remote.evt_reportedDisperserPosition.flush()
                     self.remote.evt_disperserInPosition.flush()
 
+                    dpos_initial = await self.remote.evt_reportedDisperserPosition.aget(
+                        timeout=BASE_TIMEOUT
+                    )
+
                     await self.remote.cmd_changeDisperser.set_start(
                         disperser=disperser_id, name="", timeout=LONG_TIMEOUT
                     )
-                    inpos1 = await self.remote.evt_disperserInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
-                    )
-                    inpos2 = await self.remote.evt_disperserInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
+                    await self.check_in_position_events(
+                        self.remote.evt_disperserInPosition,
+                        moved=dpos_initial.slot != disperser_id,
                     )
                     dpos = await self.remote.evt_reportedDisperserPosition.next(
                         flush=False, timeout=BASE_TIMEOUT
                     )
-                    self.assertFalse(inpos1.inPosition)
-                    self.assertTrue(inpos2.inPosition)
                     self.assertEqual(dpos.name, disperser_name)
                     self.assertEqual(dpos.slot, disperser_id)
 
@@ -408,17 +410,14 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                     await self.remote.cmd_moveLinearStage.set_start(
                         distanceFromHome=ls_pos, timeout=LONG_TIMEOUT
                     )
-                    inpos1 = await self.remote.evt_linearStageInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
-                    )
-                    inpos2 = await self.remote.evt_linearStageInPosition.next(
-                        flush=False, timeout=BASE_TIMEOUT
+                    await self.check_in_position_events(
+                        self.remote.evt_linearStageInPosition,
+                        moved=abs(lpos_initial.position - ls_pos)
+                        > self.csc.model.tolerance,
                     )
                     lpos = await self.remote.evt_reportedLinearStagePosition.aget(
                         timeout=BASE_TIMEOUT
                     )
-                    self.assertFalse(inpos1.inPosition)
-                    self.assertTrue(inpos2.inPosition)
                     self.assertAlmostEqual(lpos.position, ls_pos, places=3)
 
                     if lpos_initial.position != ls_pos:
@@ -466,6 +465,164 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
 
             await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
 
+    async def test_exposure_tracking(self) -> None:
+        async with self.make_csc(
+            initial_state=salobj.State.STANDBY, config_dir=None, simulation_mode=1
+        ):
+            # Motions are allowed again only once every exposure started has
+            # been read out.
+            self.csc.monitor_start_integration_callback(None)
+            self.csc.monitor_start_integration_callback(None)
+            self.csc.monitor_start_readout_callback(None)
+            self.assertTrue(self.csc.is_exposing)
+            self.csc.monitor_start_readout_callback(None)
+            self.assertFalse(self.csc.is_exposing)
+
+            # A missed startReadout does not block motions for good.
+            with unittest.mock.patch(
+                "lsst.ts.atspectrograph.atspec_csc._MAX_EXPOSURE_TIME", 0.1
+            ):
+                self.csc.monitor_start_integration_callback(None)
+            self.assertTrue(self.csc.is_exposing)
+            await asyncio.sleep(0.5)
+            self.assertFalse(self.csc.is_exposing)
+
+    async def test_overlapping_change_filter(self) -> None:
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
+        ):
+            fpos_initial = await self.remote.evt_reportedFilterPosition.aget(
+                timeout=BASE_TIMEOUT
+            )
+            slots = [
+                (fpos_initial.slot + 1) % self.csc.n_filter,
+                (fpos_initial.slot + 2) % self.csc.n_filter,
+            ]
+            self.remote.evt_reportedFilterPosition.flush()
+            self.remote.evt_filterInPosition.flush()
+
+            # The second command for the filter wheel is issued while the
+            # first one is moving it; it waits for the first to complete.
+            first_task = asyncio.create_task(
+                self.remote.cmd_changeFilter.set_start(
+                    filter=slots[0], timeout=LONG_TIMEOUT
+                )
+            )
+            inpos = await self.remote.evt_filterInPosition.next(
+                flush=False, timeout=LONG_TIMEOUT
+            )
+            self.assertFalse(inpos.inPosition)
+            second_task = asyncio.create_task(
+                self.remote.cmd_changeFilter.set_start(
+                    filter=slots[1], timeout=LONG_TIMEOUT
+                )
+            )
+
+            await first_task
+            self.assertFalse(second_task.done())
+            await second_task
+
+            for slot in slots:
+                with self.subTest(slot=slot):
+                    if slot != slots[0]:
+                        inpos = await self.remote.evt_filterInPosition.next(
+                            flush=False, timeout=BASE_TIMEOUT
+                        )
+                        self.assertFalse(inpos.inPosition)
+                    fpos = await self.remote.evt_reportedFilterPosition.next(
+                        flush=False, timeout=BASE_TIMEOUT
+                    )
+                    self.assertEqual(fpos.slot, slot)
+                    inpos = await self.remote.evt_filterInPosition.next(
+                        flush=False, timeout=BASE_TIMEOUT
+                    )
+                    self.assertTrue(inpos.inPosition)
+
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+
+    async def test_exposure_mid_motion(self) -> None:
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
+        ):
+            fpos_initial = await self.remote.evt_reportedFilterPosition.aget(
+                timeout=BASE_TIMEOUT
+            )
+            new_slot = (fpos_initial.slot + 1) % self.csc.n_filter
+
+            self.remote.evt_filterInPosition.flush()
+            change_filter_task = asyncio.create_task(
+                self.remote.cmd_changeFilter.set_start(
+                    filter=new_slot, timeout=LONG_TIMEOUT
+                )
+            )
+            inpos = await self.remote.evt_filterInPosition.next(
+                flush=False, timeout=LONG_TIMEOUT
+            )
+            self.assertFalse(inpos.inPosition)
+
+            # The camera starts integrating while the filter wheel moves: the
+            # motion is stopped and the command fails, without reporting the
+            # filter wheel in position.
+            self.csc.monitor_start_integration_callback(None)
+            with self.assertRaises(salobj.AckError):
+                await change_filter_task
+
+            fw_state = await self.remote.evt_fwState.aget(timeout=BASE_TIMEOUT)
+            self.assertEqual(fw_state.state, Status.NOTINPOSITION)
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.remote.evt_filterInPosition.next(
+                    flush=False, timeout=BASE_TIMEOUT
+                )
+            self.assertEqual(self.csc.summary_state, salobj.State.ENABLED)
+
+            # Motions are allowed again once the exposure is read out.
+            self.csc.monitor_start_readout_callback(None)
+            await self.remote.cmd_changeFilter.set_start(
+                filter=fpos_initial.slot, timeout=LONG_TIMEOUT
+            )
+            fpos = await self.remote.evt_reportedFilterPosition.aget(
+                timeout=BASE_TIMEOUT
+            )
+            self.assertEqual(fpos.slot, fpos_initial.slot)
+            inpos = await self.remote.evt_filterInPosition.aget(timeout=BASE_TIMEOUT)
+            self.assertTrue(inpos.inPosition)
+
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+
+    async def test_status_queries_during_move(self) -> None:
+        async with self.make_csc(
+            initial_state=salobj.State.ENABLED, config_dir=None, simulation_mode=1
+        ):
+            # Fast controller replies, so only the health loop interval limits
+            # how often the controller is queried.
+            self.csc.mock_ctrl.wait_time = 0.01
+            self.csc.mock_ctrl.wait_time_move = 2.0
+            fpos_initial = await self.remote.evt_reportedFilterPosition.aget(
+                timeout=BASE_TIMEOUT
+            )
+            new_slot = (fpos_initial.slot + 1) % self.csc.n_filter
+
+            with unittest.mock.patch.object(
+                self.csc.model,
+                "query_all_status",
+                wraps=self.csc.model.query_all_status,
+            ) as query_all_status:
+                await self.remote.cmd_changeFilter.set_start(
+                    filter=new_slot, timeout=LONG_TIMEOUT
+                )
+
+            # The poll interval starts at 50 ms and backs off to 500 ms while
+            # the filter wheel status does not change, so the 2 s motion
+            # takes about 10 status queries; waking up the health loop for
+            # every status took about 40.
+            self.assertLess(query_all_status.call_count, 20)
+            fpos = await self.remote.evt_reportedFilterPosition.aget(
+                timeout=BASE_TIMEOUT
+            )
+            self.assertEqual(fpos.slot, new_slot)
+
+            await salobj.set_summary_state(self.remote, salobj.State.STANDBY)
+
     def test_check_fg_config(self) -> None:
         config_filter = {
             "filter_name": ["a", "b", "c", "d"],
@@ -598,6 +755,34 @@ class TestATSpecCSC(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 with self.assertRaises(RuntimeError):
                     CSC.check_fg_config(bad_config[config])
 
+    def test_slot_by_name(self) -> None:
+        self.assertEqual(CSC.slot_by_name(["a", "b", "c"]), dict(a=0, b=1, c=2))
+        # A duplicated name resolves to its first slot.
+        self.assertEqual(
+            CSC.slot_by_name(["empty", "a", "empty", "b"]), dict(empty=0, a=1, b=3)
+        )
+
+    async def check_in_position_events(
+        self, topic: salobj.topics.ReadTopic, moved: bool
+    ) -> None:
+        """Check the in-position events published by a motion command.
+
+        An element that moves reports inPosition=False then inPosition=True;
+        an element that is already in position only reports inPosition=True.
+
+        Parameters
+        ----------
+        topic : `salobj.topics.ReadTopic`
+            The in-position event topic of the element.
+        moved : `bool`
+            Is the element expected to move?
+        """
+        if moved:
+            inpos = await topic.next(flush=False, timeout=BASE_TIMEOUT)
+            self.assertFalse(inpos.inPosition)
+        inpos = await topic.next(flush=False, timeout=BASE_TIMEOUT)
+        self.assertTrue(inpos.inPosition)
+
     def monitor_state_callback(self, data: salobj.type_hints.BaseMsgType) -> None:
         self.state_published_last = Status(data.state)
         self.state_published.add(Status(data.state))